@@ -1,15 +1,18 @@
-import base64
-import io
-import json
+import multiprocessing
 import os
+import re
 import shutil
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice, repeat
 from pathlib import Path
 import sys
-from typing import List
-from pydub import AudioSegment
-from praatio import textgrid
+from typing import Iterable, Iterator, List, Tuple
+import ijson
+import numpy as np
+import orjson
+from numba import njit
 import mongo_adaptor
 from mongo_adaptor import PhonemeSegment
 
@@ -20,224 +23,440 @@ AUDIO_IN = DATASET / "audio"
 TEXT_IN = DATASET / "transcripts"
 
 WORK_DIR = Path("mfa_work")
-WAV_DIR = WORK_DIR
+AUDIO_DIR = WORK_DIR
 LAB_DIR = WORK_DIR
 ALIGN_DIR = WORK_DIR / "aligned"
 JSON_OUT = DATASET / "phonemes_json"
+PHONEME_ALIGNMENT_JSONL = DATASET / "phoneme_alignment.jsonl"
 
 MIN_PHONE_DUR = 0.035      # 35 ms
 MERGE_THRESHOLD = 0.025    # merge phones shorter than this
 ANTICIPATION_SHIFT = 0.015 # shift starts earlier for animation
 
+PLOSIVES = frozenset({"B", "D", "G", "P", "T", "K"})  # followed by a schwa at word ends
+SCHWA_CMU = "EH"
+SCHWA_IPA = "ɛ"
+
+# Labels MFA's english_us_arpa model emits (vowels with optional stress digit); these need no normalisation
+_ARPABET_VOWELS = ("AA", "AE", "AH", "AO", "AW", "AY", "EH", "ER", "EY", "IH", "IY", "OW", "OY", "UH", "UW")
+_ARPABET_CONSONANTS = ("B", "CH", "D", "DH", "F", "G", "HH", "JH", "K", "L", "M", "N", "NG",
+                       "P", "R", "S", "SH", "T", "TH", "V", "W", "Y", "Z", "ZH")
+ARPABET_PHONES = frozenset(_ARPABET_CONSONANTS + tuple(v + s for v in _ARPABET_VOWELS for s in ("", "0", "1", "2")))
+
+STREAM_BATCH_SIZE = 64     # entries held in memory at once while streaming
+
 # Read mongo config from env
 MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
 MONGO_DATABASE = os.environ.get("MONGO_DATABASE", "learn-nation")
 MONGO_COLLECTION = os.environ.get("MONGO_COLLECTION", "audioentries")
 # ----------------------------------------
 
+# Timestamp stamped on every phonemeAlignment written this run; set once at the start of main()
+RUN_TS = None
+RUN_TS_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
 def ensure_dirs(clean=False):
     if clean:
         for d in [WORK_DIR]:
             if d.exists():
                 shutil.rmtree(d)
 
-    for d in [WAV_DIR, LAB_DIR, ALIGN_DIR, JSON_OUT]:
+    for d in [AUDIO_DIR, LAB_DIR, ALIGN_DIR, JSON_OUT]:
         d.mkdir(parents=True, exist_ok=True)
 
-def get_entries(from_mongo=False):
+def get_entries(from_mongo=False, projection=None) -> Iterator[dict]:
+    """Yield alignment entries one at a time; dataset/alignment.json is streamed rather than loaded whole.
+    projection limits the fields fetched from MongoDB (ignored for the file)."""
     if from_mongo:
-        return mongo_adaptor.read_alignment_entries()
+        yield from mongo_adaptor.iter_alignment_entries(projection=projection)
     else:
         alignment_path = DATASET / "alignment.json"
-        with open(alignment_path, "r", encoding="utf8") as f:
-            return json.load(f)
+        with open(alignment_path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
 
-def convert_audio(entries: List[dict]):
-    """Convert audio from dataset/alignment.json (audioBase64) to 16k mono wav for MFA.
-    Uses voiceKeyHash as the output filename."""
 
-    for entry in entries:
-        voice_key_hash = entry.get("voiceKeyHash")
-        audio_b64 = entry.get("audioBase64")
-        if not voice_key_hash or not audio_b64:
-            continue
+def _batched(entries: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    """Group a (possibly streamed) iterable into lists of at most size items."""
+    it = iter(entries)
+    while batch := list(islice(it, size)):
+        yield batch
 
-        wav_path = WAV_DIR / f"{voice_key_hash}.wav"
-        if wav_path.exists():
-            continue
 
-        audio_bytes = base64.b64decode(audio_b64)
-        audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
-        audio = audio.set_channels(1).set_frame_rate(16000)
-        audio.export(wav_path, format="wav")
+def _mp_context():
+    """Start pool workers from a forkserver where available, platform default elsewhere. Forking this process
+    directly would copy it mid-run with the MongoClient's monitor/pool threads live, which is not fork-safe."""
+    return multiprocessing.get_context("forkserver") if "forkserver" in multiprocessing.get_all_start_methods() else None
 
-        print("Converted:", voice_key_hash)
 
+def _write_one(voice_key_hash: str, audio: dict):
+    """Write one entry's audio (see mongo_adaptor.AUDIO_FIELDS) out as mp3. Returns voiceKeyHash, or None if skipped."""
+    if not voice_key_hash or not audio:
+        return None
 
-def copy_transcripts(entries: List[dict]):
-    """Build .lab files from dataset/alignment.json: join normalisedAlignment.characters, named by voiceKeyHash."""
-    for entry in entries:
-        voice_key_hash = entry.get("voiceKeyHash")
-        norm = entry.get("normalisedAlignment") or {}
-        characters = norm.get("characters")
-        if not voice_key_hash or characters is None:
-            continue
+    audio_path = AUDIO_DIR / f"{voice_key_hash}.mp3"
+    if audio_path.exists():
+        return None
+
+    if not mongo_adaptor.fetch_audio_to_file(audio, audio_path):
+        return None
+
+    return voice_key_hash
 
-        text = "".join(characters).strip()
-        lab_path = LAB_DIR / f"{voice_key_hash}.lab"
-        with open(lab_path, "w", encoding="utf8") as f:
-            f.write(text)
 
-        print("Wrote lab:", voice_key_hash)
+def write_audio(entries: Iterable[dict]):
+    """Write audio from dataset/alignment.json or MongoDB (audioBinary, GridFS or audioBase64) as mp3 for MFA,
+    which decodes and resamples it itself. Uses voiceKeyHash as the output filename. Entries are written in parallel."""
+
+    # Each write is at most a b64decode plus file I/O, so threads overlap it without copying audio to workers
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # executor.map submits its whole input up front, so feed it bounded batches to keep streaming
+        for batch in _batched(entries, STREAM_BATCH_SIZE):
+            hashes, audio = [], []
+            for entry in batch:
+                # Keep only the audio fields, not the whole entry (alignment arrays etc.).
+                # Popping them means the audio is released with this batch.
+                hashes.append(entry.get("voiceKeyHash"))
+                audio.append({field: entry.pop(field) for field in mongo_adaptor.AUDIO_FIELDS if field in entry})
+
+            for voice_key_hash in executor.map(_write_one, hashes, audio):
+                if voice_key_hash:
+                    print("Wrote audio:", voice_key_hash)
+
+
+def _copy_one(entry: dict):
+    """Write a single entry's .lab file. Returns voiceKeyHash, or None if skipped."""
+    voice_key_hash = entry.get("voiceKeyHash")
+    # Nothing downstream needs the character alignment once the .lab is built
+    norm = entry.pop("normalisedAlignment", None) or {}
+    characters = norm.get("characters")
+    if not voice_key_hash or characters is None:
+        return None
+
+    text = "".join(characters).strip()
+    lab_path = LAB_DIR / f"{voice_key_hash}.lab"
+    with open(lab_path, "w", encoding="utf8") as f:
+        f.write(text)
+
+    return voice_key_hash
+
+
+def copy_transcripts(entries: Iterable[dict]):
+    """Build .lab files from dataset/alignment.json: join normalisedAlignment.characters, named by voiceKeyHash."""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for batch in _batched(entries, STREAM_BATCH_SIZE):
+            for voice_key_hash in executor.map(_copy_one, batch):
+                if voice_key_hash:
+                    print("Wrote lab:", voice_key_hash)
+
+
+def _iter_textgrids(root) -> Iterator[str]:
+    """Recursively yield paths of .TextGrid files under root (os.scandir; cheaper than Path.glob).
+    Yields nothing if root does not exist (e.g. before ensure_dirs() or any MFA output)."""
+    try:
+        it = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_textgrids(entry.path)
+            elif entry.name.endswith(".TextGrid"):
+                yield entry.path
 
 
 def run_mfa(acoustic_model: str, dictionary: str, single_speaker: bool = True):
-    """Run MFA alignment"""
-    print("Running MFA alignment...")
-    work_dir = str(WORK_DIR.resolve())
+    """Run MFA alignment. Only audio without an existing TextGrid in ALIGN_DIR is aligned."""
+    audio_stems = {p.stem for p in AUDIO_DIR.glob("*.mp3")}
+    aligned_stems = {Path(p).stem for p in _iter_textgrids(ALIGN_DIR)}
+    pending = audio_stems - aligned_stems
+    if not pending:
+        print("All audio already aligned, skipping MFA.")
+        return
+
+    corpus_dir = WORK_DIR
+    flags = ["--clean", "--overwrite"]
+    pending_dir = WORK_DIR / "_pending"
+    shutil.rmtree(pending_dir, ignore_errors=True)
+    if len(pending) < len(audio_stems):
+        # Stage only the new mp3/lab pairs so MFA doesn't re-align the whole corpus.
+        # Existing TextGrids are left alone, so --overwrite is dropped.
+        pending_dir.mkdir()
+        for stem in pending:
+            for src in (AUDIO_DIR / f"{stem}.mp3", LAB_DIR / f"{stem}.lab"):
+                if src.exists():
+                    (pending_dir / src.name).symlink_to(src.resolve())
+        corpus_dir = pending_dir
+        flags = ["--clean"]
+
+    print(f"Running MFA alignment on {len(pending)} of {len(audio_stems)} files...")
+    work_dir = str(corpus_dir.resolve())
     align_dir = str(ALIGN_DIR.resolve())
     speaker = "--single_speaker" if single_speaker else ""
-    print(f"Command: mfa align {work_dir} {dictionary} {acoustic_model} {align_dir} --clean --overwrite {speaker}")
-    
-    subprocess.run([
-        "mfa",
-        "align",
-        work_dir,
-        dictionary,
-        acoustic_model,
-        align_dir,
-        "--clean",
-        "--overwrite",
-        speaker
-    ], check=True)
-
-
-def load_phones_from_textgrid(tg_path):
-    """Extract phoneme intervals from MFA TextGrid"""
-    tg = textgrid.openTextgrid(tg_path, includeEmptyIntervals=False)
+    print(f"Command: mfa align {work_dir} {dictionary} {acoustic_model} {align_dir} {' '.join(flags)} {speaker}")
 
-    # MFA typically names tier "phones"
-    phone_tier = tg._tierDict.get("phones")
-    if phone_tier is None:
-        raise RuntimeError(f"No phones tier in {tg_path}")
+    try:
+        subprocess.run([
+            "mfa",
+            "align",
+            work_dir,
+            dictionary,
+            acoustic_model,
+            align_dir,
+            *flags,
+            speaker
+        ], check=True)
+    finally:
+        # Never leave staged links behind for a later full run to pick up
+        shutil.rmtree(pending_dir, ignore_errors=True)
 
-    phones = []
-    for start, end, label in phone_tier.entries:
-        label = label.strip()
-        if not label or label.lower() == "spn":
-            continue
 
-        phones.append({
-            "phone": label.upper(),
-            "start": float(start),
-            "end": float(end),
-        })
+# Phones as structure-of-arrays: (labels: object array, starts: float64 array, ends: float64 array), seconds
+Phones = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
-    return phones
 
+# Long-format TextGrid (MFA's default output): the tier header, the next tier, and one interval
+_PHONES_TIER_RE = re.compile(r'^\s*name = "phones"\s*$', re.MULTILINE)
+_ITEM_RE = re.compile(r'^\s*item \[\d+\]:', re.MULTILINE)
+_INTERVAL_RE = re.compile(r'xmin = ([-+.\deE]+)\s+xmax = ([-+.\deE]+)\s+text = "((?:[^"]|"")*)"')
 
-def postprocess(phones: List[dict], is_cmu: bool):
 
-    # ---- additional schwa after plosive ends of words ----
-    PLOSIVES = {"B", "D", "G", "P", "T", "K"}
-    SCHWA = "EH" if is_cmu else "ɛ"
-    with_schwas = [] # build a new list of phones with schwa's inserted if necesssary
-
-    for i, p in enumerate(phones):
-        with_schwas.append(p) # add the current phone to the result
+def load_phones_from_textgrid(tg_path) -> Phones:
+    """Extract phoneme intervals from MFA TextGrid"""
+    text = Path(tg_path).read_text(encoding="utf8")
 
-        # check if plosive
-        if p["phone"] not in PLOSIVES:
-            continue
-        
-        # determine next phone + gap
-        if i + 1 < len(phones):
-            next_p = phones[i+1]
-            gap = next_p["start"] - p["end"]
-        else:
-            gap = float('inf') # last phoneme, so there is no gap
-
-        if gap > MIN_PHONE_DUR:
-            with_schwas.append({
-                "phone": SCHWA,
-                "start": p["end"],
-                "end": p["end"] + MIN_PHONE_DUR
-                })
-
-    # ---- anticipation shift ----
-    for p in with_schwas:
-        p["start"] = max(0.0, p["start"] - ANTICIPATION_SHIFT)
-
-    # ---- merge tiny phones ----
-    merged = []
-    for p in with_schwas:
-        dur = p["end"] - p["start"]
-
-        if merged and dur < MERGE_THRESHOLD:
-            # merge into previous phone
-            merged[-1]["end"] = p["end"]
-        else:
-            merged.append(p)
-
-    # ---- enforce minimum duration ----
-    for i, p in enumerate(merged):
-        dur = p["end"] - p["start"]
-        if dur < MIN_PHONE_DUR:
-            deficit = MIN_PHONE_DUR - dur
-            p["end"] += deficit
-
-            # push next start forward if overlapping
-            if i+1 < len(merged) and merged[i+1]["start"] < p["end"]:
-                merged[i+1]["start"] = p["end"]
-
-    return merged
-
-
-def export_json(name: str, phones: List[PhonemeSegment]):
-
-    with open(JSON_OUT / f"{name}.json", "w") as f:
-        json.dump(phones, f, indent=2)
-
-    # Append to original alignment.json under phonemeAlignment
+    # MFA typically names tier "phones"; its intervals run until the next tier header
+    header = _PHONES_TIER_RE.search(text)
+    if header is None:
+        raise RuntimeError(f"No phones tier in {tg_path}")
+    next_item = _ITEM_RE.search(text, header.end())
+    block = text[header.end():next_item.start() if next_item else len(text)]
+
+    labels, starts, ends = [], [], []
+    for match in _INTERVAL_RE.finditer(block):
+        label = match.group(3)
+        if label not in ARPABET_PHONES:
+            # IPA or unexpected label: trim, drop silence/unknown, upper-case
+            label = label.strip()
+            if not label or label.lower() == "spn":
+                continue
+            label = label.replace('""', '"').upper()
+
+        labels.append(label)
+        starts.append(float(match.group(1)))
+        ends.append(float(match.group(2)))
+
+    return np.array(labels, dtype=object), np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64)
+
+
+@njit(cache=True)
+def _postprocess_sweep(starts, ends, plosive, shift, merge_thresh, min_dur):
+    """
+    Single forward pass over the phones: schwa insertion, anticipation shift, tiny-phone merge and
+    minimum duration. A kept phone's end is only final once the next kept phone arrives, so its
+    minimum duration is enforced then, pushing that next start forward if they overlap.
+    Returns output starts, ends and the source index of each phone (-1 for an inserted schwa).
+    """
+    n = len(starts)
+    # at most one schwa per input phone
+    out_starts = np.empty(2 * n)
+    out_ends = np.empty(2 * n)
+    src_idx = np.empty(2 * n, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        for j in range(2):
+            if j == 0:
+                s, e, idx = starts[i], ends[i], i
+            else:
+                # ---- additional schwa after plosive ends of words ----
+                # the last phoneme has no next, so its gap is infinite
+                gap = starts[i+1] - ends[i] if i + 1 < n else np.inf
+                if not (plosive[i] and gap > min_dur):
+                    break
+                s, e, idx = ends[i], ends[i] + min_dur, -1
+
+            # ---- anticipation shift ----
+            s = max(0.0, s - shift)
+
+            # ---- merge tiny phones ----
+            if k > 0 and e - s < merge_thresh:
+                out_ends[k-1] = e
+                continue
+
+            # ---- enforce minimum duration on the previous phone, now that its end is final ----
+            if k > 0:
+                dur = out_ends[k-1] - out_starts[k-1]
+                if dur < min_dur:
+                    out_ends[k-1] += min_dur - dur
+
+                    # push this start forward if overlapping
+                    if s < out_ends[k-1]:
+                        s = out_ends[k-1]
+
+            out_starts[k] = s
+            out_ends[k] = e
+            src_idx[k] = idx
+            k += 1
+
+    if k > 0:
+        dur = out_ends[k-1] - out_starts[k-1]
+        if dur < min_dur:
+            out_ends[k-1] += min_dur - dur
+
+    return out_starts[:k], out_ends[:k], src_idx[:k]
+
+
+def postprocess(labels: np.ndarray, starts: np.ndarray, ends: np.ndarray, is_cmu: bool) -> Phones:
+    plosive = np.fromiter((label in PLOSIVES for label in labels), dtype=bool, count=len(labels))
+    starts, ends, src_idx = _postprocess_sweep(starts, ends, plosive, ANTICIPATION_SHIFT, MERGE_THRESHOLD, MIN_PHONE_DUR)
+
+    labels = labels[src_idx]
+    labels[src_idx < 0] = SCHWA_CMU if is_cmu else SCHWA_IPA
+
+    return labels, starts, ends
+
+
+def _write_once(path, data: bytes, flags: int):
+    """Open path with O_WRONLY|O_CREAT|flags and write data in a single os.write call.
+    Raises OSError on a short write rather than leaving a truncated file or partial JSONL line behind."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | flags, 0o644)
+    try:
+        written = os.write(fd, data)
+    finally:
+        os.close(fd)
+    if written != len(data):
+        raise OSError(f"Short write to {path}: {written} of {len(data)} bytes")
+
+
+def export_json(name: str, phones: List[PhonemeSegment], created: str):
+
+    _write_once(JSON_OUT / f"{name}.json", orjson.dumps(phones, option=orjson.OPT_INDENT_2), os.O_TRUNC)
+
+    # Append one line to phoneme_alignment.jsonl; merge_phoneme_alignments() folds these into alignment.json
+    record = {
+        "voiceKeyHash": name,
+        "phonemeAlignment": {
+            "created": created,
+            "alignment": phones,
+        },
+    }
+    # One write() on an O_APPEND fd, so lines from parallel parse workers never interleave
+    _write_once(PHONEME_ALIGNMENT_JSONL, orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE), os.O_APPEND)
+
+
+def load_phonemes_from_export_json(file_path) -> List[PhonemeSegment]:
+    """Load a phonemes_json/{voiceKeyHash}.json written by export_json(). It is already [{cmu, start, end}, ...]."""
+    with open(file_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def load_phonemes_many(paths: Iterable) -> List[List[PhonemeSegment]]:
+    """Load many export JSONs, overlapping the file reads on a thread pool. Results are in input order."""
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(load_phonemes_from_export_json, paths))
+
+
+def merge_phoneme_alignments():
+    """Stream alignment.json once, setting phonemeAlignment on each entry from phoneme_alignment.jsonl."""
     alignment_path = DATASET / "alignment.json"
-    with open(alignment_path, "r", encoding="utf8") as f:
-        entries = json.load(f)
-    for entry in entries:
-        if entry.get("voiceKeyHash") == name:
-            entry["phonemeAlignment"] = {
-                "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                "alignment": phones,
-            }
-            break
-    with open(alignment_path, "w", encoding="utf8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    if not PHONEME_ALIGNMENT_JSONL.exists():
+        return
+    if not alignment_path.exists():
+        # No local dataset to merge into (e.g. --use-mongo runs); don't leave the side file behind
+        PHONEME_ALIGNMENT_JSONL.unlink()
+        return
+
+    by_hash = {}
+    with open(PHONEME_ALIGNMENT_JSONL, "rb") as f:
+        for line in f:
+            if line.strip():
+                record = orjson.loads(line)
+                by_hash[record["voiceKeyHash"]] = record["phonemeAlignment"]
+
+    # Write alongside and swap in, so an interrupted merge never truncates alignment.json
+    tmp_path = alignment_path.with_suffix(".json.tmp")
+    with open(alignment_path, "rb") as src, open(tmp_path, "wb") as dst:
+        dst.write(b"[")
+        count = 0
+        for entry in ijson.items(src, "item", use_float=True):
+            phoneme_alignment = by_hash.get(entry.get("voiceKeyHash"))
+            if phoneme_alignment is not None:
+                entry["phonemeAlignment"] = phoneme_alignment
+            # Indent each entry one level so the file reads as a normal indent=2 array
+            dst.write(b",\n  " if count else b"\n  ")
+            dst.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            count += 1
+        dst.write(b"\n]" if count else b"]")
+
+    os.replace(tmp_path, alignment_path)
+    PHONEME_ALIGNMENT_JSONL.unlink()
+    print(f"Merged {len(by_hash)} phoneme alignments into {alignment_path}")
+
+
+def _process_one_tg(tg_file: str, is_cmu: bool, created: str):
+    """Parse, postprocess and export one TextGrid. Returns (voiceKeyHash, alignment)."""
+    name = Path(tg_file).stem
+
+    # Parse TextGrid into phones
+    labels, starts, ends = load_phones_from_textgrid(tg_file)
+
+    # Postprocess phones (anticipation shift, merge tiny phones, enforce minimum duration)
+    labels, starts, ends = postprocess(labels, starts, ends, is_cmu)
+
+    # Cleanup (round) times, map to cmu/start/end
+    alignment = [
+        PhonemeSegment(cmu=label, start=round(start, 4), end=round(end, 4))
+        for label, start, end in zip(labels.tolist(), starts.tolist(), ends.tolist())
+    ]
+
+    # Write to individual JSON files, append to phoneme_alignment.jsonl
+    export_json(name, alignment, created)
+
+    return name, alignment
 
 
 def parse_outputs(write_to_mongo=False, is_cmu=True):
     """Parse MFA TextGrids and publish"""
 
-    for tg_file in ALIGN_DIR.glob("**/*.TextGrid"):
-        name = tg_file.stem
-
-        # Parse TextGrid into phones
-        phones = load_phones_from_textgrid(tg_file)
-
-        # Postprocess phones (anticipation shift, merge tiny phones, enforce minimum duration)
-        phones = postprocess(phones, is_cmu)
+    # Start a fresh side file for this run's results
+    PHONEME_ALIGNMENT_JSONL.unlink(missing_ok=True)
 
-        # Cleanup (round) times, map to cmu/start/end
-        alignment = [PhonemeSegment(cmu=p["phone"], start=round(p["start"], 4), end=round(p["end"], 4)) for p in phones]
-
-        # Write to individual JSON files, append/overwrite field to object in alignment.json
-        export_json(name, alignment)
+    tg_files = list(_iter_textgrids(ALIGN_DIR))
+    # Called standalone (outside main()), stamp this call's results instead of leaving created null
+    created = RUN_TS or datetime.now(timezone.utc).strftime(RUN_TS_FORMAT)
 
+    # Parsing is per-file and independent; Mongo writes stay in this process (clients are not fork-safe)
+    # and are flushed in small batches while later TextGrids are still being parsed
+    writer = None
+    with ProcessPoolExecutor(mp_context=_mp_context()) as executor:
+        results = executor.map(_process_one_tg, tg_files, repeat(is_cmu), repeat(created), chunksize=8)
         if write_to_mongo:
-            mongo_adaptor.write_phonemes_to_document(alignment, voice_key_hash=name)
-
-        print("Exported:", name)
-
+            # Alignments come straight from postprocess as {cmu, start, end} with float times
+            writer = mongo_adaptor.BatchWriter(trusted_schema=True)
+        try:
+            for name, alignment in results:
+                if writer is not None:
+                    writer.add({"voiceKeyHash": name}, alignment)
+
+                print("Exported:", name)
+        except BaseException:
+            # Still wait for in-flight batches, but report the parse failure rather than a write error
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception as e:
+                    print("MongoDB write failed while stopping:", e)
+            raise
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        print(f"Wrote {writer.count} phoneme alignments to MongoDB")
+
+
+def main(migrate_mongo=False, is_cmu=True, incremental=False):
+    global RUN_TS
+    RUN_TS = datetime.now(timezone.utc).strftime(RUN_TS_FORMAT)
 
-def main(migrate_mongo=False, is_cmu=True):
     # Set phone type
     acoustic_model = "english_us_arpa" if is_cmu else "english_mfa"
     dictionary = "english_us_arpa" if is_cmu else "english_mfa"
@@ -246,12 +465,14 @@ def main(migrate_mongo=False, is_cmu=True):
         print("Processing audio entries from MongoDB.")
         mongo_adaptor.init(uri=MONGO_URI, database=MONGO_DATABASE, collection=MONGO_COLLECTION)
 
-    ensure_dirs(clean=True)
-    entries = get_entries(migrate_mongo)
-    convert_audio(entries)
-    copy_transcripts(entries)
+    # Incremental runs keep mfa_work so existing audio and TextGrids are reused
+    ensure_dirs(clean=not incremental)
+    # Each stage streams its own pass over the entries
+    write_audio(get_entries(migrate_mongo, mongo_adaptor.AUDIO_PROJECTION))
+    copy_transcripts(get_entries(migrate_mongo, mongo_adaptor.TRANSCRIPT_PROJECTION))
     run_mfa(acoustic_model, dictionary)
     parse_outputs(migrate_mongo, is_cmu)
+    merge_phoneme_alignments()
 
     if migrate_mongo:
         mongo_adaptor.close()
@@ -269,4 +490,5 @@ if __name__ == "__main__":
             sys.exit(1)
         MONGO_URI = argv[i + 1]
     is_cmu = "--cmu" in argv
-    main(migrate_mongo, is_cmu)
+    incremental = "--incremental" in argv
+    main(migrate_mongo, is_cmu, incremental)
@@ -0,0 +1,32 @@
+"""
+One-off migration: copy each audioentries document's audioBase64 into a raw BSON binary audioBinary field,
+which align_dataset reads in preference to the base64 string (see mongo_adaptor.fetch_audio_to_file).
+
+  python migrate_audio_binary.py <mongourl> [--drop-base64]
+
+--drop-base64 also removes audioBase64 from migrated documents; only use it once nothing else reads that field.
+"""
+
+import os
+import sys
+import mongo_adaptor
+
+MONGO_DATABASE = os.environ.get("MONGO_DATABASE", "learn-nation")
+MONGO_COLLECTION = os.environ.get("MONGO_COLLECTION", "audioentries")
+
+
+def main(uri: str, drop_base64: bool = False):
+    mongo_adaptor.init(uri=uri, database=MONGO_DATABASE, collection=MONGO_COLLECTION)
+    try:
+        modified = mongo_adaptor.migrate_audio_base64_to_binary(drop_base64=drop_base64)
+    finally:
+        mongo_adaptor.close()
+    print(f"Migrated {modified} documents to audioBinary.")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    if not argv or argv[0].startswith("--"):
+        sys.stderr.write("Error: requires a URI (e.g. python migrate_audio_binary.py mongodb://localhost:27017)\n")
+        sys.exit(1)
+    main(argv[0], drop_base64="--drop-base64" in argv)
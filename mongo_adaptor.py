@@ -3,20 +3,33 @@ Read alignment data from a MongoDB collection (same shape as dataset/alignment.j
 and write phoneme alignment results back to documents.
 
 Batch workflow (e.g. 1500 docs, or 10–100 with created_before filter):
-  1. read_alignment_entries(..., created_before=...) → list of docs
-  2. For each doc: decode audioBase64 → write {voiceKeyHash}.wav; build transcript → write {voiceKeyHash}.lab
-  3. Run MFA once on the whole wav+lab directory (one align command for all)
-  4. For each generated TextGrid: load_phones_from_textgrid → postprocess → write_phonemes_to_document(..., voice_key_hash=...)
-  This keeps one Mongo read, one MFA run, and N writes back to Mongo.
+  1. iter_alignment_entries(..., created_before=...) → docs streamed from a server cursor
+  2. For each doc: fetch_audio_to_file → write {voiceKeyHash}.mp3; build transcript → write {voiceKeyHash}.lab
+     (each pass reads with a projection of just the fields it needs, see AUDIO_PROJECTION / TRANSCRIPT_PROJECTION)
+  3. Run MFA once on the whole mp3+lab directory (one align command for all)
+  4. For each generated TextGrid: load_phones_from_textgrid → postprocess → collect (voice_key_hash, alignment)
+  5. BatchWriter.add() per result → bulk_writes of 100 sent in the background while parsing continues
+     (or write_phonemes_to_documents_bulk(collected) → one bulk_write round trip per 1000 documents)
+  This keeps the Mongo reads to the fields actually used, one MFA run, and batched writes back to Mongo.
 """
 
+import base64
 import json
+import os
+import warnings
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
-from pymongo import MongoClient
+from operator import itemgetter
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from pymongo.collection import Collection
 from pymongo.database import Database
-from bson import ObjectId
-from typing import Any, List, Optional, TypedDict, Union
+from pymongo.uri_parser import parse_uri
+from bson import Binary, ObjectId, encode as bson_encode
+from bson.raw_bson import RawBSONDocument
+from gridfs import GridFSBucket
+from typing import Any, Iterator, List, Optional, Tuple, TypedDict, Union
 
 
 class PhonemeSegment(TypedDict):
@@ -26,10 +39,58 @@ class PhonemeSegment(TypedDict):
     end: float
 
 
+# Where a document's audio can live, in order of preference (see fetch_audio_to_file):
+# raw BSON binary, a GridFS file id, or the legacy base64 string.
+AUDIO_FIELDS = ("audioBinary", "audioFileId", "audioBase64")
+
+# Projections for the read passes: audio only where it is decoded, never for transcripts or write-back.
+# audioBase64 is only sent for documents that have neither audioBinary nor audioFileId, so migrated documents
+# that still keep the legacy string don't ship both copies (projection expressions need MongoDB 4.4+).
+AUDIO_PROJECTION = {
+    "_id": 1,
+    "voiceKeyHash": 1,
+    "audioBinary": 1,
+    "audioFileId": 1,
+    "audioBase64": {
+        "$cond": [
+            {"$or": [{"$ifNull": ["$audioBinary", False]}, {"$ifNull": ["$audioFileId", False]}]},
+            "$$REMOVE",
+            "$audioBase64",
+        ]
+    },
+}
+TRANSCRIPT_PROJECTION = {"_id": 1, "voiceKeyHash": 1, "normalisedAlignment.characters": 1}
+METADATA_PROJECTION = {"_id": 1, "voiceKeyHash": 1, "script": 1}
+
+
 # ---------------------------------------------------------------------------
 # Connection / session config
 # ---------------------------------------------------------------------------
 
+# MongoClient defaults used by init(); any of these can be overridden via the URI or init(**client_kwargs).
+# Wire compression matters most for the audioBase64 reads; zstd needs pymongo's [zstd] extra
+# (pymongo warns and falls back to zlib without it). minPoolSize keeps connections warm for concurrent writers.
+DEFAULT_CLIENT_OPTIONS: dict = {
+    "maxPoolSize": 200,
+    "minPoolSize": 32,
+    "compressors": "zstd,zlib",
+}
+
+def client_options(uri: str, client_kwargs: dict) -> dict:
+    """
+    Keyword options for MongoClient(uri, ...): DEFAULT_CLIENT_OPTIONS, minus any the URI already sets
+    (keyword options would otherwise override e.g. ?maxPoolSize= in the URI), then client_kwargs on top.
+    """
+    uri_options = parse_uri(uri)["options"]
+    defaults = {key: value for key, value in DEFAULT_CLIENT_OPTIONS.items() if key not in uri_options}
+    options = {**defaults, **client_kwargs}
+    # A smaller maxPoolSize from the URI must not be undercut by the default minPoolSize
+    max_pool_size = options.get("maxPoolSize", uri_options.get("maxPoolSize"))
+    if "minPoolSize" in defaults and "minPoolSize" not in client_kwargs and max_pool_size is not None:
+        options["minPoolSize"] = min(defaults["minPoolSize"], max_pool_size)
+    return options
+
+
 # Stored after init(); used by read_* and write_phonemes_to_document. Call init() before any other function.
 _config: dict = {
     "uri": None,
@@ -37,29 +98,67 @@ _config: dict = {
     "coll_name": None,
     "client_kwargs": None,
     "client": None,
+    "db": None,
     "collection": None,
 }
 
+# Module-level handle to the same collection as _config["collection"], kept in sync by init()/close() so
+# the hot write helpers read one global instead of going through _get_collection().
+_COLLECTION: Optional[Collection] = None
+
+_NOT_INITIALISED = "Call mongo_adaptor.init(uri=..., database=..., collection=...) first."
+
 
 def init(
     uri: str = "mongodb://localhost:27017",
     database: str = "learn-nation",
     collection: str = "audioentries",
+    ensure_indexes: bool = True,
     **client_kwargs,
 ) -> None:
     """
     Set the connection config for this module. Must be called once before using read_alignment_entries(),
     write_phonemes_to_document(), etc.
+
+    ensure_indexes: create the voiceKeyHash (unique) and created indexes if missing; see _ensure_indexes().
+    client_kwargs: passed to MongoClient on top of DEFAULT_CLIENT_OPTIONS (see client_options()).
     """
-    client = MongoClient(uri, **client_kwargs)
+    global _COLLECTION
+    client = MongoClient(uri, **client_options(uri, client_kwargs))
     db: Database = client[database]
     coll = db[collection]
+    if ensure_indexes:
+        _ensure_indexes(coll)
     _config["uri"] = uri
     _config["database"] = database
     _config["coll_name"] = collection
     _config["client_kwargs"] = client_kwargs
     _config["client"] = client
+    _config["db"] = db
     _config["collection"] = coll
+    _COLLECTION = coll
+
+
+def _ensure_indexes(coll: Collection) -> None:
+    """
+    Index the fields every query filters on: voiceKeyHash (all writes, lookups) and created
+    (read_alignment_entries created_before). create_index is a no-op when the index already exists.
+    If duplicate hashes or a conflicting existing index prevent a unique voiceKeyHash index, a plain
+    one is created instead. Any index that still cannot be created (e.g. no createIndex privilege) is
+    skipped with a warning rather than failing init().
+    """
+    try:
+        coll.create_index("voiceKeyHash", unique=True, background=True)
+    except (OperationFailure, DuplicateKeyError) as e:
+        warnings.warn(f"Could not create unique voiceKeyHash index, falling back to a non-unique one: {e}")
+        try:
+            coll.create_index("voiceKeyHash", background=True)
+        except OperationFailure as e:
+            warnings.warn(f"Could not create voiceKeyHash index, leaving existing indexes: {e}")
+    try:
+        coll.create_index("created", background=True)
+    except OperationFailure as e:
+        warnings.warn(f"Could not create created index, leaving existing indexes: {e}")
 
 
 def close() -> None:
@@ -68,18 +167,28 @@ def close() -> None:
     Called automatically on process exit if init() was used. Can also be called explicitly
     (e.g. from main() in a try/finally) to release the connection early.
     """
+    global _COLLECTION
     client = _config.get("client")
     if client is not None:
         client.close()
         _config["client"] = None
+        _config["db"] = None
         _config["collection"] = None
+        _COLLECTION = None
 
 
 def _get_collection() -> Collection:
     """Return the collection set by init(). Raises if init() has not been called."""
-    if _config["collection"] is None:
-        raise ValueError("Call mongo_adaptor.init(uri=..., database=..., collection=...) first.")
-    return _config["collection"]
+    if _COLLECTION is None:
+        raise ValueError(_NOT_INITIALISED)
+    return _COLLECTION
+
+
+def _get_database() -> Database:
+    """Return the database set by init(). Raises if init() has not been called."""
+    if _config["db"] is None:
+        raise ValueError(_NOT_INITIALISED)
+    return _config["db"]
 
 
 # ---------------------------------------------------------------------------
@@ -87,17 +196,21 @@ def _get_collection() -> Collection:
 # ---------------------------------------------------------------------------
 
 
-def read_alignment_entries(
+def iter_alignment_entries(
     created_before: Optional[datetime] = None,
-) -> List[dict]:
+    batch_size: int = 50,
+    projection: Optional[dict] = None,
+) -> Iterator[dict]:
     """
-    Read documents from the alignment collection, optionally filtered by created timestamp.
+    Yield documents from the alignment collection one at a time, optionally filtered by created timestamp.
     Requires init() to have been called.
 
-    Returns a list of documents with the same logical shape as dataset/alignment.json
-    (e.g. script, voiceId, voiceKeyHash, audioBase64, alignment, normalisedAlignment, etc.).
+    Documents have the same logical shape as dataset/alignment.json. The server cursor fetches
+    batch_size documents per round trip, so client memory is bounded by one batch rather than the
+    whole result set; drop each document (or its audioBase64) before moving on to keep it that way.
 
     created_before: only include documents whose `created` field is < this (timezone-aware).
+    projection: optional find() projection to limit the fields returned (see AUDIO_PROJECTION etc.).
     """
     collection = _get_collection()
 
@@ -105,19 +218,129 @@ def read_alignment_entries(
     if created_before is not None:
         query["created"] = {"$lt": created_before}
 
-    cursor = collection.find(query)
-    return list(cursor)
+    yield from collection.find(query, projection=projection, batch_size=batch_size)
+
+
+def read_alignment_entries(
+    created_before: Optional[datetime] = None,
+    projection: Optional[dict] = None,
+) -> List[dict]:
+    """
+    Read documents from the alignment collection, optionally filtered by created timestamp.
+    Requires init() to have been called.
+
+    Returns a list of documents with the same logical shape as dataset/alignment.json
+    (e.g. script, voiceId, voiceKeyHash, audioBase64, alignment, normalisedAlignment, etc.).
+    Loads everything at once; prefer iter_alignment_entries() for large collections.
+
+    created_before: only include documents whose `created` field is < this (timezone-aware).
+    projection: optional find() projection, e.g. METADATA_PROJECTION to skip audioBase64.
+    """
+    return list(iter_alignment_entries(created_before=created_before, projection=projection))
 
 
-def read_alignment_entry_by_voice_key_hash(voice_key_hash: str) -> Optional[dict]:
+def read_alignment_entry_by_voice_key_hash(voice_key_hash: str, projection: Optional[dict] = None) -> Optional[dict]:
     """Return a single document matching voiceKeyHash, or None. Requires init() to have been called."""
-    return _get_collection().find_one({"voiceKeyHash": voice_key_hash})
+    return _get_collection().find_one({"voiceKeyHash": voice_key_hash}, projection=projection)
 
 
-def read_alignment_entry_by_id(document_id: Union[str, ObjectId]) -> Optional[dict]:
+def read_alignment_entry_by_id(document_id: Union[str, ObjectId], projection: Optional[dict] = None) -> Optional[dict]:
     """Return a single document by _id, or None. Requires init() to have been called."""
     oid = ObjectId(document_id) if isinstance(document_id, str) else document_id
-    return _get_collection().find_one({"_id": oid})
+    return _get_collection().find_one({"_id": oid}, projection=projection)
+
+
+# ---------------------------------------------------------------------------
+# Audio (audioBinary / GridFS audioFileId / legacy audioBase64)
+# ---------------------------------------------------------------------------
+
+
+def fetch_audio_to_file(doc: dict, out_path: Union[str, os.PathLike]) -> bool:
+    """
+    Write a document's audio bytes to out_path, using the first of AUDIO_FIELDS present:
+      audioBinary: raw bytes (BSON Binary), written directly with no decode.
+      audioFileId: GridFS file id, streamed to disk chunk by chunk (constant memory). Requires init().
+      audioBase64: legacy base64 string, decoded.
+    Works on plain dataset/alignment.json entries too (audioBase64 only).
+
+    Returns False if the document carries no audio.
+    """
+    data = None
+    file_id = None
+    if doc.get("audioBinary") is not None:
+        data = doc["audioBinary"]
+    elif doc.get("audioFileId") is not None:
+        file_id = doc["audioFileId"]
+    elif doc.get("audioBase64"):
+        # Decode before touching the filesystem, so bad base64 raises without leaving a file behind
+        data = base64.b64decode(doc["audioBase64"])
+    else:
+        return False
+
+    # Write alongside and swap in, so a failed write or GridFS stream never leaves a partial file behind
+    tmp_path = f"{os.fspath(out_path)}.part"
+    try:
+        with open(tmp_path, "wb") as f:
+            if data is not None:
+                f.write(data)
+            else:
+                GridFSBucket(_get_database()).download_to_stream(file_id, f)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def migrate_audio_base64_to_binary(drop_base64: bool = False, batch_size: int = 100) -> int:
+    """
+    Store each document's audioBase64 as raw bytes in audioBinary (33% smaller on the wire and on disk,
+    no client-side decode). Requires init() to have been called. Safe to re-run: only documents without
+    audioBinary are touched.
+
+    drop_base64: also $unset audioBase64. Off by default, since other readers of the collection may still
+    expect it. Keeping both copies adds ~75% to each document, so audio over ~9 MB of base64 can exceed
+    the 16 MB document limit; those updates are skipped with a warning (re-run with drop_base64 for them).
+    batch_size: documents read per cursor batch and updates sent per bulk_write.
+
+    Returns the number of documents modified.
+    """
+    collection = _get_collection()
+
+    def flush(ops) -> int:
+        # Unordered, so one oversized document fails alone; count the rest and carry on
+        try:
+            return collection.bulk_write(ops, ordered=False).modified_count
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if e.details.get("writeConcernErrors") or not errors:
+                raise
+            warnings.warn(
+                f"Skipped {len(errors)} document(s) in audioBinary migration: {errors[0].get('errmsg')}"
+            )
+            return e.details.get("nModified", 0)
+
+    cursor = collection.find(
+        {"audioBase64": {"$exists": True}, "audioBinary": {"$exists": False}},
+        projection={"audioBase64": 1},
+        batch_size=batch_size,
+    )
+    modified = 0
+    ops = []
+    for doc in cursor:
+        update: dict = {"$set": {"audioBinary": Binary(base64.b64decode(doc["audioBase64"]))}}
+        if drop_base64:
+            update["$unset"] = {"audioBase64": ""}
+        ops.append(UpdateOne({"_id": doc["_id"]}, update))
+        if len(ops) >= batch_size:
+            modified += flush(ops)
+            ops = []
+    if ops:
+        modified += flush(ops)
+    return modified
 
 
 # ---------------------------------------------------------------------------
@@ -125,10 +348,43 @@ def read_alignment_entry_by_id(document_id: Union[str, ObjectId]) -> Optional[di
 # ---------------------------------------------------------------------------
 
 
+_segment_fields = itemgetter("cmu", "start", "end")
+
+
+def normalise_alignment(alignment: List[PhonemeSegment], trusted_schema: bool = False) -> List[PhonemeSegment]:
+    """
+    Return alignment items as exactly { cmu, start, end } with float times.
+    trusted_schema skips the rebuild entirely for input already in that form; otherwise float() is
+    only called for times that are not already floats.
+    """
+    if trusted_schema:
+        return alignment
+    return [
+        {
+            "cmu": cmu,
+            "start": start if type(start) is float else float(start),
+            "end": end if type(end) is float else float(end),
+        }
+        for cmu, start, end in map(_segment_fields, alignment)
+    ]
+
+
+def build_phonemes_doc(alignment_payload: List[PhonemeSegment], created: Optional[datetime] = None) -> dict:
+    """
+    Build the phonemes field value. Bulk writers pass one `created` for the whole batch so the
+    clock is read once per call rather than once per document; None means now.
+    """
+    return {
+        "created": created if created is not None else datetime.now(timezone.utc),
+        "alignment": alignment_payload,
+    }
+
+
 def write_phonemes_to_document(
     alignment: List[PhonemeSegment],
     document_id: Optional[Union[str, ObjectId]] = None,
     voice_key_hash: Optional[str] = None,
+    trusted_schema: bool = False,
 ) -> Optional[Any]:
     """
     Write phoneme alignment back to the same document in the collection.
@@ -144,6 +400,8 @@ def write_phonemes_to_document(
     Provide exactly one of: document_id, or voice_key_hash (to identify the document).
 
     alignment: list of PhonemeSegment (cmu, start, end).
+    trusted_schema: alignment is already exactly [{cmu: str, start: float, end: float}, ...]
+    (e.g. straight from align_dataset.postprocess), so it is written as-is; see normalise_alignment().
 
     Returns the result of update_one.
     """
@@ -158,21 +416,191 @@ def write_phonemes_to_document(
     else:
         filter_query = {"voiceKeyHash": voice_key_hash}
 
-    # Normalise alignment items to exactly { cmu, start, end }
-    alignment_payload = [
-        {
-            "cmu": item["cmu"],
-            "start": float(item["start"]),
-            "end": float(item["end"]),
-        }
-        for item in alignment
-    ]
-
-    phonemes = {
-        "created": datetime.now(timezone.utc),
-        "alignment": alignment_payload,
-    }
+    phonemes = build_phonemes_doc(normalise_alignment(alignment, trusted_schema))
 
     result = collection.update_one(filter_query, {"$set": {"phonemes": phonemes}})
     return result
 
+
+def write_phonemes_to_document_fast(
+    filter_query: dict,
+    alignment_payload: List[PhonemeSegment],
+    *,
+    created: datetime,
+) -> Any:
+    """
+    Hot-loop variant of write_phonemes_to_document(): the caller supplies a ready filter (e.g.
+    {"voiceKeyHash": ...} or {"_id": ObjectId(...)}), an already canonical { cmu, start, end } payload,
+    and the batch timestamp. No argument checks, ObjectId parsing or normalisation are done here.
+    Requires init() to have been called.
+
+    Returns the result of update_one.
+    """
+    if _COLLECTION is None:
+        raise ValueError(_NOT_INITIALISED)
+    return _COLLECTION.update_one(
+        filter_query,
+        {"$set": {"phonemes": build_phonemes_doc(alignment_payload, created)}},
+    )
+
+
+# Max UpdateOne ops sent per bulk_write call; keeps each batch within the server's write batch limits
+BULK_WRITE_BATCH_SIZE = 1000
+
+
+def _phonemes_update_op(filter_query: dict, alignment_payload: List[PhonemeSegment], created: datetime) -> UpdateOne:
+    """Build the UpdateOne for one document's phonemes field, with the $set payload pre-encoded to BSON."""
+    # Encode each $set payload to BSON once here; bulk_write copies the raw bytes into the batch
+    set_doc = RawBSONDocument(bson_encode({"phonemes": build_phonemes_doc(alignment_payload, created)}))
+    return UpdateOne(filter_query, {"$set": set_doc})
+
+
+def write_phonemes_to_documents_bulk(
+    items: List[Tuple[Union[str, ObjectId], List[PhonemeSegment]]],
+    *,
+    by: str = "voice_key_hash",
+    bypass_document_validation: bool = False,
+    trusted_schema: bool = False,
+) -> List[Any]:
+    """
+    Write phoneme alignment for many documents with unordered bulk_write calls instead of one
+    update_one per document. Requires init() to have been called.
+
+    Same schema as write_phonemes_to_document(); every document in the call gets the same `created`.
+
+    items: list of (key, alignment). key is a voiceKeyHash when by="voice_key_hash", or a document _id
+    (str or ObjectId) when by="document_id".
+
+    Ops are sent in batches of BULK_WRITE_BATCH_SIZE. Unordered, so one failed update does not stop the rest.
+    bypass_document_validation needs the bypassDocumentValidation privilege, so it is off by default.
+    trusted_schema: as for write_phonemes_to_document().
+
+    Returns the list of BulkWriteResult, one per batch (empty if items is empty).
+    """
+    collection = _get_collection()
+
+    if by == "voice_key_hash":
+        def filter_for(key):
+            return {"voiceKeyHash": key}
+    elif by == "document_id":
+        def filter_for(key):
+            return {"_id": ObjectId(key) if isinstance(key, str) else key}
+    else:
+        raise ValueError('by must be "voice_key_hash" or "document_id".')
+
+    created = datetime.now(timezone.utc)
+    ops = []
+    for key, alignment in items:
+        ops.append(_phonemes_update_op(filter_for(key), normalise_alignment(alignment, trusted_schema), created))
+
+    results = []
+    for i in range(0, len(ops), BULK_WRITE_BATCH_SIZE):
+        results.append(collection.bulk_write(
+            ops[i:i + BULK_WRITE_BATCH_SIZE],
+            ordered=False,
+            bypass_document_validation=bypass_document_validation,
+        ))
+    return results
+
+
+def write_phonemes_concurrent(
+    items: List[Tuple[str, List[PhonemeSegment]]],
+    max_workers: int = 16,
+    trusted_schema: bool = False,
+) -> List[Any]:
+    """
+    Write phoneme alignment per document with update_one, fanned out over a thread pool.
+    Requires init() to have been called.
+
+    For callers that need per-document update_one semantics rather than write_phonemes_to_documents_bulk().
+    pymongo releases the GIL while waiting on the socket, so threads overlap the round trips;
+    the client's connection pool is shared by all workers.
+
+    items: list of (voice_key_hash, alignment). Same schema as write_phonemes_to_document().
+    trusted_schema: as for write_phonemes_to_document().
+
+    Returns the UpdateResults in completion order. The first failed write is re-raised once all
+    submitted writes have finished.
+    """
+    if _COLLECTION is None:
+        raise ValueError(_NOT_INITIALISED)
+
+    created = datetime.now(timezone.utc)
+    # Filters and payloads are built once up front; workers only issue the update
+    tasks = [
+        ({"voiceKeyHash": voice_key_hash}, normalise_alignment(alignment, trusted_schema))
+        for voice_key_hash, alignment in items
+    ]
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(write_phonemes_to_document_fast, filter_query, alignment_payload, created=created)
+            for filter_query, alignment_payload in tasks
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
+
+
+class BatchWriter:
+    """
+    Stream phoneme alignment writes to Mongo while results are still being produced.
+    Requires init() to have been called.
+
+    add() queues one update; every flush_size queued updates go out as one unordered bulk_write on a
+    background thread, with at most max_inflight batches in flight. close() sends the remainder and
+    waits for every batch, re-raising the first failed bulk_write. Every update from one writer gets
+    the same `created`.
+
+      writer = BatchWriter()
+      for voice_key_hash, alignment in results:
+          writer.add({"voiceKeyHash": voice_key_hash}, alignment)
+      writer.close()
+
+    trusted_schema: as for write_phonemes_to_document().
+    """
+
+    def __init__(self, flush_size: int = 100, max_inflight: int = 4, trusted_schema: bool = False):
+        if _COLLECTION is None:
+            raise ValueError(_NOT_INITIALISED)
+        self._collection = _COLLECTION
+        self.flush_size = flush_size
+        self.trusted_schema = trusted_schema
+        self.created = datetime.now(timezone.utc)
+        self.count = 0
+        self._pending: deque = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight)
+        self._max_inflight = max_inflight
+        self._futures = []
+
+    def add(self, filter_query: dict, alignment: List[PhonemeSegment]) -> None:
+        """Queue one document's phonemes update; flushes once flush_size updates are queued."""
+        alignment_payload = normalise_alignment(alignment, self.trusted_schema)
+        self._pending.append(_phonemes_update_op(filter_query, alignment_payload, self.created))
+        self.count += 1
+        if len(self._pending) >= self.flush_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        ops = list(self._pending)
+        self._pending.clear()
+        # Bound the batches held in memory to roughly what the workers can have in flight
+        in_flight = [f for f in self._futures if not f.done()]
+        if len(in_flight) >= self._max_inflight:
+            wait(in_flight, return_when=FIRST_COMPLETED)
+        self._futures.append(self._executor.submit(self._collection.bulk_write, ops, ordered=False))
+
+    def close(self) -> List[Any]:
+        """
+        Flush the remaining updates and wait for all batches.
+
+        Returns the list of BulkWriteResult, one per batch, in submission order.
+        """
+        try:
+            self._flush()
+        finally:
+            self._executor.shutdown(wait=True)
+        return [future.result() for future in self._futures]
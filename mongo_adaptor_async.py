@@ -0,0 +1,140 @@
+"""
+Async counterpart of mongo_adaptor: stream alignment documents and write phoneme results back
+using pymongo's native asyncio client (AsyncMongoClient), so many Mongo round trips can be in
+flight at once from a single event loop.
+
+Same data shapes and phonemes schema as mongo_adaptor. Typical use:
+
+  await init(uri=..., database=..., collection=...)
+  async for doc in iter_alignment_entries(projection=mongo_adaptor.AUDIO_PROJECTION): ...
+  ... run MFA (sync, one subprocess) ...
+  await bulk_write_phonemes([(voice_key_hash, alignment), ...])
+  await close()
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from pymongo import AsyncMongoClient, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from mongo_adaptor import (
+    BULK_WRITE_BATCH_SIZE,
+    PhonemeSegment,
+    build_phonemes_doc,
+    client_options,
+    normalise_alignment,
+)
+
+
+# ---------------------------------------------------------------------------
+# Connection / session config
+# ---------------------------------------------------------------------------
+
+# Stored after init(); used by the read/write helpers. Await init() before any other function.
+_config: dict = {
+    "client": None,
+    "collection": None,
+}
+
+
+async def init(
+    uri: str = "mongodb://localhost:27017",
+    database: str = "learn-nation",
+    collection: str = "audioentries",
+    **client_kwargs,
+) -> None:
+    """
+    Set the connection config for this module. Must be awaited once before using
+    iter_alignment_entries() and bulk_write_phonemes().
+
+    client_kwargs: passed to AsyncMongoClient on top of mongo_adaptor.DEFAULT_CLIENT_OPTIONS
+    (see mongo_adaptor.client_options()).
+    """
+    client = AsyncMongoClient(uri, **client_options(uri, client_kwargs))
+    _config["client"] = client
+    _config["collection"] = client[database][collection]
+
+
+async def close() -> None:
+    """Close the client created by init(). Idempotent; safe to call multiple times."""
+    client = _config.get("client")
+    if client is not None:
+        await client.close()
+        _config["client"] = None
+        _config["collection"] = None
+
+
+def _get_collection() -> AsyncCollection:
+    """Return the collection set by init(). Raises if init() has not been awaited."""
+    if _config["collection"] is None:
+        raise ValueError("Await mongo_adaptor_async.init(uri=..., database=..., collection=...) first.")
+    return _config["collection"]
+
+
+# ---------------------------------------------------------------------------
+# Read (same data shape as dataset/alignment.json)
+# ---------------------------------------------------------------------------
+
+
+async def iter_alignment_entries(
+    created_before: Optional[datetime] = None,
+    batch_size: int = 50,
+    projection: Optional[dict] = None,
+) -> AsyncIterator[dict]:
+    """
+    Yield documents from the alignment collection as the server cursor delivers them (batch_size per
+    round trip), optionally filtered by created timestamp.
+
+    created_before: only include documents whose `created` field is < this (timezone-aware).
+    projection: optional find() projection, e.g. mongo_adaptor.AUDIO_PROJECTION.
+    """
+    collection = _get_collection()
+
+    query: dict = {}
+    if created_before is not None:
+        query["created"] = {"$lt": created_before}
+
+    async for doc in collection.find(query, projection=projection, batch_size=batch_size):
+        yield doc
+
+
+# ---------------------------------------------------------------------------
+# Phoneme alignment writes (phonemes.alignment: List[PhonemeSegment])
+# ---------------------------------------------------------------------------
+
+
+def _phonemes_update(alignment: List[PhonemeSegment], created: datetime, trusted_schema: bool) -> dict:
+    """Build the $set update for one document's phonemes field, using mongo_adaptor's normalisation."""
+    return {"$set": {"phonemes": build_phonemes_doc(normalise_alignment(alignment, trusted_schema), created)}}
+
+
+async def bulk_write_phonemes(
+    items: List[Tuple[str, List[PhonemeSegment]]],
+    max_concurrency: int = 4,
+    trusted_schema: bool = False,
+) -> List[Any]:
+    """
+    Write phoneme alignment for many documents, matched by voiceKeyHash, as unordered bulk_write
+    batches of BULK_WRITE_BATCH_SIZE, with at most max_concurrency batches in flight.
+
+    items: list of (voice_key_hash, alignment).
+    trusted_schema: as for mongo_adaptor.write_phonemes_to_document().
+
+    Returns the list of BulkWriteResult, one per batch, in input order.
+    """
+    collection = _get_collection()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    created = datetime.now(timezone.utc)
+
+    ops = [UpdateOne({"voiceKeyHash": key}, _phonemes_update(alignment, created, trusted_schema))
+           for key, alignment in items]
+
+    async def write_batch(batch: List[UpdateOne]):
+        async with semaphore:
+            return await collection.bulk_write(batch, ordered=False)
+
+    return await asyncio.gather(*[
+        write_batch(ops[i:i + BULK_WRITE_BATCH_SIZE])
+        for i in range(0, len(ops), BULK_WRITE_BATCH_SIZE)
+    ])